@@ -6,53 +6,125 @@ This module interacts with the Rekor transparency log to:
 - Fetch log entries and checkpoints.
 - Verify consistency between two checkpoints with Merkle proofs.
 
-Requires a `config.ini` file containing the Rekor API base URL.
+The Rekor API base URL defaults to the public instance. It can be overridden
+with the `REKOR_BASE_URL` environment variable or a `config.ini` file with a
+`[rekor]` section containing `base_url`; either is read on the first API call.
 
-Usage:
-    - Enable debug mode:
-        python verifier.py --debug
+Usage (the `rektor` console script, or `python -m rektor`):
+    - Enable debug mode (together with one of the modes below):
+        rektor --debug --checkpoint
     - Fetch the latest checkpoint:
-        python verifier.py --checkpoint
+        rektor --checkpoint
     - Verify artifact inclusion in the Rekor log using log index:
-        python verifier.py --inclusion <log_index> --artifact <filepath>
+        rektor --inclusion <log_index> --artifact <filepath>
     - Verify consistency between a previous checkpoint and the latest:
-        python verifier.py --consistency --tree-id <tree_id>
+        rektor --consistency --tree-id <tree_id>
         --tree-size <tree_size> --root-hash <root_hash>
 
 Dependencies:
-    - argparse, requests, json, base64, configparser
-    - util, merkle_proof (custom modules)
+    - argparse, requests, orjson, binascii, configparser
+    - util, merkle_proof (custom modules; util is imported on first use)
 """
 
 import argparse
-import json
-import base64
+import configparser
+import copy
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+import functools
+import hashlib
+import itertools
+import binascii
+import os
+import sys
+import threading
 from pathlib import Path
+import orjson
 import requests
-from .util import (
-    extract_public_key,
-    verify_artifact_signature,
-)  # Utility functions for signature handling
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from .merkle_proof import (  # Importing Merkle proof-related functions
     DefaultHasher,
-    RootMismatchError,
     verify_consistency,
     verify_inclusion,
     compute_leaf_hash,
 )
 
-# Initialize the global base_url
+# Default Rekor API base URL, used when no override is configured
 base_url = "https://rekor.sigstore.dev/api/v1"
 
+# Rekor API endpoint templates, appended to the resolved base URL
+_ENTRIES_URL = "{}/log/entries?logIndex={}"
+_RETRIEVE_URL = "{}/log/entries/retrieve"
+_LOG_URL = "{}/log"
+_PROOF_URL = "{}/log/proof?firstSize={}&lastSize={}"
+
+# Maximum number of log indexes Rekor accepts in one bulk retrieve request
+_RETRIEVE_MAXSIZE = 10
+
+# Number of worker threads used by the batched verifiers
+_MAX_WORKERS = 16
+
+# Log entries already fetched, keyed by log index (entries are immutable),
+# stored as (entry, leaf hash) pairs so the entry itself stays unmodified
+_entry_cache: OrderedDict[int, tuple[dict, str | None]] = OrderedDict()
+_ENTRY_CACHE_MAXSIZE = 1024
+
+# Latest checkpoint and its ETag, stored as one (etag, checkpoint) tuple so
+# both are replaced together
+_checkpoint_cached: tuple[str, dict] | None = None
+
+# Signatures already verified, keyed by (signature, key fingerprint, artifact digest)
+_verified_signatures: OrderedDict[tuple[bytes, bytes, bytes], bool] = OrderedDict()
+_VERIFIED_SIGNATURES_MAXSIZE = 256
+
+# Guards the LRU caches, which the batch worker threads read and write
+_cache_lock = threading.Lock()
+
+# Shared HTTP session so every Rekor request reuses pooled keep-alive connections
+_session = requests.Session()
+_session.mount(
+    "https://",
+    HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=_MAX_WORKERS,  # One pooled connection per batch worker
+        max_retries=Retry(
+            total=3, backoff_factor=0.2, status_forcelist=[429, 502, 503, 504]
+        ),
+    ),
+)
+
+
+# Resolves the Rekor API base URL on first use
+@functools.lru_cache(maxsize=None)
+def _get_base_url():
+    """
+    Resolve the Rekor API base URL from the REKOR_BASE_URL environment
+    variable, then config.ini, falling back to the public Rekor instance.
+    """
+    env_url = os.environ.get("REKOR_BASE_URL")
+    if env_url:
+        return env_url.rstrip("/")
+
+    config = configparser.ConfigParser()
+    config.read("config.ini")  # Missing files are silently skipped
+    return config.get("rekor", "base_url", fallback=base_url).rstrip("/")
+
 
 # Check if the provided index is a valid number
 def sane_index(index):
     """
     Check if the provided log index is a valid number.
-    input: int:index
+    input: int|str:index
     output: bool
     """
-    return str(index).isdigit()  # Validate if the index is a digit (i.e., a number)
+    if isinstance(index, bool):  # bool is an int subclass, but not an index
+        return False
+    if isinstance(index, int):  # Fast path: argparse already parses --inclusion
+        return index >= 0
+    # Only ASCII digits; str.isdigit() alone also accepts digits such as "²"
+    # that int() rejects
+    return isinstance(index, str) and index.isascii() and index.isdigit()
 
 
 # Check if the provided path is a valid file path and exists
@@ -63,59 +135,217 @@ def sane_path(path):
     Path(path).resolve(strict=True)  # Ensure the path is valid and the file exists
 
 
+# Looks up a key in an LRU cache, marking it as most recently used
+def _lru_get(cache, key):
+    """
+    Return the cached value for key, or None if it is not cached.
+    """
+    with _cache_lock:
+        value = cache.pop(key, None)
+        if value is not None:
+            cache[key] = value  # Re-insert as the most recently used entry
+    return value
+
+
+# Stores a value in an LRU cache, evicting the oldest entry when full
+def _lru_put(cache, key, value, maxsize):
+    """
+    Cache value under key and return it.
+    """
+    with _cache_lock:
+        cache[key] = value
+        if len(cache) > maxsize:
+            cache.popitem(last=False)  # Evict the least recently used entry
+    return value
+
+
+# Sends a Rekor API request and parses the JSON response body
+def _request_json(method, api, **kwargs):
+    """
+    Send a request with the shared session and parse the body with orjson.
+    The body is read once as bytes, with no intermediate str decode, and the
+    connection goes back to the pool as soon as it has been read.
+    """
+    with _session.request(method, api, stream=True, timeout=10, **kwargs) as response:
+        return orjson.loads(response.content)
+
+
+# Caches a log entry together with its precomputed leaf hash
+def _cache_entry(log_index, entry):
+    """
+    Cache a log entry and its RFC 6962 leaf hash by log index.
+    Returns the cached (entry, leaf hash) pair.
+    """
+    leaf_hash = None
+    if isinstance(entry, dict) and "body" in entry:  # Error responses have no body
+        leaf_hash = compute_leaf_hash(entry["body"])
+    return _lru_put(_entry_cache, log_index, (entry, leaf_hash), _ENTRY_CACHE_MAXSIZE)
+
+
+# Fetches the raw log entry for an index from the Rekor API
+def _fetch_entry(log_index):
+    """
+    Fetch the raw Rekor log entry for a given int log index, using the entry
+    cache. Returns the cached (entry, leaf hash) pair.
+    Raises requests.exceptions.Timeout if the request times out.
+    """
+    cached = _lru_get(_entry_cache, log_index)
+    if cached is not None:
+        return cached
+
+    api = _ENTRIES_URL.format(_get_base_url(), log_index)  # Construct API URL
+    data = _request_json("GET", api)  # Send GET request to fetch log entry
+    # The response maps the single entry UUID to the log entry
+    ((_, entry),) = data.items()
+    return _cache_entry(log_index, entry)
+
+
+# Fetches up to _RETRIEVE_MAXSIZE log entries in one bulk request
+def _retrieve_entries(log_indexes):
+    """
+    Fetch several Rekor log entries with one POST to the bulk retrieve
+    endpoint and cache them. Raises on network errors and on responses that
+    are not a list of log entries.
+    """
+    api = _RETRIEVE_URL.format(_get_base_url())
+    data = _request_json(
+        "POST",
+        api,
+        data=orjson.dumps({"logIndexes": log_indexes}),
+        headers={"Content-Type": "application/json"},
+    )
+    # The response is a list of single-entry {UUID: entry} mappings
+    for item in data:
+        ((_, entry),) = item.items()
+        _cache_entry(entry["logIndex"], entry)
+
+
+# Errors a failed fetch can raise: network failures, bodies that are not JSON,
+# and Rekor error bodies that do not have the shape of a log entry
+_FETCH_ERRORS = (
+    requests.exceptions.RequestException,
+    ValueError,
+    AttributeError,
+    KeyError,
+)
+
+
+# Caches many log entries, batching the cache misses into bulk requests
+def _warm_entries(log_indexes, debug=False):
+    """
+    Resolve many log indexes against the entry cache, fetching the misses
+    with bulk retrieve requests. Returns the cached (entry, leaf hash) pairs
+    in input order, with None for invalid or unavailable indexes. The pairs
+    are the cached objects themselves and must not be modified.
+    """
+    log_indexes = [int(index) if sane_index(index) else None for index in log_indexes]
+    missing = dict.fromkeys(  # Unique uncached indexes, in input order
+        index
+        for index in log_indexes
+        if index is not None and _lru_get(_entry_cache, index) is None
+    )
+    chunks = itertools.batched(missing, _RETRIEVE_MAXSIZE)
+
+    def retrieve(chunk):
+        try:
+            _retrieve_entries(chunk)
+        except _FETCH_ERRORS as e:  # Fall back to one request per index
+            if debug:
+                print("Bulk retrieve failed:", e)
+            for index in chunk:
+                try:
+                    _fetch_entry(index)
+                except _FETCH_ERRORS as e:  # Leave the entry missing
+                    if debug:
+                        print("Could not fetch log index", index, e)
+
+    with ThreadPoolExecutor(max_workers=_MAX_WORKERS) as executor:
+        list(executor.map(retrieve, chunks))
+
+    return [
+        None if index is None else _lru_get(_entry_cache, index)
+        for index in log_indexes
+    ]
+
+
+# Fetches many log entries, batching the cache misses into bulk requests
+def get_log_entries_bulk(log_indexes, debug=False):
+    """
+    Fetch the Rekor log entries for many log indexes. Cached entries are
+    resolved first and the misses are fetched with bulk retrieve requests.
+    Returns a list of entries in input order, with None for invalid or
+    unavailable indexes. The entries are copies, safe to modify.
+    """
+    cached = _warm_entries(log_indexes, debug)
+    return [None if pair is None else copy.deepcopy(pair[0]) for pair in cached]
+
+
+# Builds the inclusion proof of a log entry, including its leaf hash
+def _inclusion_proof(log, leaf_hash):
+    """
+    Extract the inclusion proof from a log entry and attach its leaf hash,
+    which was computed once when the entry was fetched.
+    """
+    proof = copy.deepcopy(
+        log["verification"]["inclusionProof"]
+    )  # Copy the inclusion proof so the cached entry is left untouched
+    proof["leafHash"] = leaf_hash  # Add the computed leaf hash to the proof
+    return proof
+
+
 # Fetches and decodes the body of a log entry by its index
 def get_log_body(log_index, debug=False):
     """
     Fetch and decode the body of a Rekor log entry by its index.
     """
-    if not sane_index(log_index):  # Check if log index is valid
-        if debug:
-            # Print a message in debug mode
-            print("The value is Not a Number (NaN).")
+    cached = _get_entry(log_index, debug)  # Fetch the full log entry
+    if cached is None:
         return None
+    log, _ = cached
 
-    # Construct API endpoint URL
-    api = f"{base_url}/log/entries?logIndex={log_index}"
-    try:
-        data = requests.get(
-            api, timeout=10
-        ).json()  # Send GET request to fetch log entry
-    except requests.exceptions.Timeout:  # Handle request timeout
-        if debug:
-            print("Timed out")  # Print timeout message in debug mode
-        return None
+    # Decode the base64-encoded body without the b64decode wrapper and parse
+    # the JSON bytes directly
+    return orjson.loads(binascii.a2b_base64(log["body"]))
 
-    # Extract the body from the log entry
-    body = next(iter(data.values()))["body"]
-    body = json.loads(
-        base64.b64decode(body)
-    )  # Decode the base64-encoded body and parse JSON
-    return body  # Return the decoded log body
 
-
-# Fetches a full log entry by its index
-def get_log_entry(log_index, debug=False):
+# Fetches a cached log entry and its leaf hash by its index
+def _get_entry(log_index, debug=False):
     """
-    Fetch a full Rekor log entry by its index.
+    Fetch a Rekor log entry by its index as the cached (entry, leaf hash)
+    pair, or None if the index is invalid or the entry is unavailable.
+    The entry is shared with the cache and must not be modified.
     """
     if not sane_index(log_index):  # Check if the log index is valid
         if debug:
             print("The value is Not a Number (NaN).")
         return None
-
-    # Construct the API URL
-    api = f"{base_url}/log/entries?logIndex={log_index}"
+    if not isinstance(log_index, int):  # argparse already passes an int
+        log_index = int(log_index)  # Validated digit string from a library caller
 
     try:
-        data = requests.get(api, timeout=10).json()  # Fetch the log entry
+        cached = _fetch_entry(log_index)  # Fetch the log entry
     except requests.exceptions.Timeout:  # Handle timeout errors
         if debug:
             print("Timed out")
         return None
+    except ValueError:  # Response is not a single {UUID: entry} mapping
+        if debug:
+            print("Unexpected response for log index", log_index)
+        return None
+
+    return cached
 
-    # Extract the log entry from the returned data
-    log = next(iter(data.values()))
-    return log  # Return the full log entry
+
+# Fetches a full log entry by its index
+def get_log_entry(log_index, debug=False):
+    """
+    Fetch a full Rekor log entry by its index. The entry is a copy, so
+    callers may modify it without affecting the cache.
+    """
+    cached = _get_entry(log_index, debug)
+    if cached is None:
+        return None
+    return copy.deepcopy(cached[0])  # Return the full log entry
 
 
 # Fetches the verification proof (inclusion proof) for a log entry
@@ -123,82 +353,153 @@ def get_verification_proof(log_index, debug=False):
     """
     Fetch the verification proof (inclusion proof) for a given log entry.
     """
-    if not sane_index(log_index):  # Validate the log index
-        if debug:
-            print("The value is Not a Number (NaN).")
+    cached = _get_entry(log_index, debug)  # Fetch the full log entry
+    if cached is None:
         return None
 
-    log = get_log_entry(log_index)  # Fetch the full log entry
-    body = log["body"]  # Extract the body from the log entry
-    # Compute the leaf hash for inclusion proof
-    leaf_hash = compute_leaf_hash(body)
-    proof = log["verification"][
-        "inclusionProof"
-    ]  # Extract the inclusion proof from the log
-    proof["leafHash"] = leaf_hash  # Add the computed leaf hash to the proof
-    return proof  # Return the inclusion proof
+    return _inclusion_proof(*cached)  # Return the inclusion proof
+
+
+# Parses a base64 certificate into its public key, cached by the encoded cert
+@functools.lru_cache(maxsize=128)
+def _parse_cert(cert_content):
+    """
+    Decode a base64 certificate and extract its PEM public key. Entries signed
+    by the same certificate share one decode and one X.509 parse.
+    """
+    # Imported here so modes that never verify signatures skip loading cryptography
+    from .util import extract_public_key
+
+    return extract_public_key(binascii.a2b_base64(cert_content))
+
+
+# Verifies an artifact signature, skipping work for already verified artifacts
+def _verify_signature_cached(signature, public_key, artifact_filepath):
+    """
+    Verify the signature of an artifact unless the same signature, public key
+    and artifact contents have already been verified.
+    """
+    from .util import verify_artifact_signature  # Loads cryptography on first use
+
+    # Hash the artifact in fixed-size chunks instead of reading it into memory
+    with open(artifact_filepath, "rb") as artifact:
+        artifact_digest = hashlib.file_digest(artifact, "sha256").digest()
+    key = (signature, hashlib.sha256(public_key).digest(), artifact_digest)
+
+    if _lru_get(_verified_signatures, key):  # Signature already verified
+        print("Signature is valid")
+        return True
+
+    if not verify_artifact_signature(signature, public_key, artifact_digest):
+        return False
+
+    # Remember the successful verification
+    return _lru_put(_verified_signatures, key, True, _VERIFIED_SIGNATURES_MAXSIZE)
 
 
 # Verifies the inclusion of an artifact in the transparency log
 def inclusion(log_index, artifact_filepath, debug=False):
     """
     Verify the inclusion of an artifact in the transparency log by its log index.
+    Returns True if both the signature and the inclusion proof are valid.
     """
     sane_path(artifact_filepath)  # Validate the file path
-    log = get_log_body(log_index)  # Fetch the log body
+    # Fetch the log entry once; both the body and the proof are derived from it
+    cached = _get_entry(log_index, debug)
     try:
-        signature = base64.b64decode(
+        entry, leaf_hash = cached
+        log = orjson.loads(binascii.a2b_base64(entry["body"]))  # Decode the log body
+        signature = binascii.a2b_base64(
             log["spec"]["signature"]["content"]
         )  # Decode the signature
-    except KeyError:
+    except (KeyError, TypeError):
         print("Invalid log index")
-        return
-
-    cert = base64.b64decode(
-        log["spec"]["signature"]["publicKey"]["content"]
-    )  # Decode the public key
-    # Extract the public key from the certificate
-    public_key = extract_public_key(cert)
-    verify_artifact_signature(
+        return False
+
+    # Extract the public key from the base64 certificate
+    public_key = _parse_cert(log["spec"]["signature"]["publicKey"]["content"])
+    if not _verify_signature_cached(
         signature, public_key, artifact_filepath
-    )  # Verify the signature
-    proof = get_verification_proof(log_index)  # Fetch the inclusion proof
-    verify_inclusion(  # Verify the inclusion proof
+    ):  # Verify the signature
+        return False
+    proof = _inclusion_proof(entry, leaf_hash)  # Extract the inclusion proof
+    if not verify_inclusion(  # Verify the inclusion proof
         DefaultHasher,
         proof["logIndex"],
         proof["treeSize"],
         proof["leafHash"],
         proof["hashes"],
         proof["rootHash"],
-    )
+    ):
+        return False
     if debug:
         print("inclusion successful")  # Print success message in debug mode
+    return True
+
+
+# Verifies the inclusion of many artifacts with concurrent Rekor requests
+def inclusion_many(pairs, debug=False):
+    """
+    Verify the inclusion of many (log_index, artifact_filepath) pairs concurrently.
+    Returns a list of (pair, result) tuples in input order. A pair whose check
+    fails or raises gets False without affecting the other results.
+    The checks print their usual messages as they run, so output from
+    different pairs may interleave; use the returned results instead.
+    """
+    pairs = list(pairs)
+    # Warm the entry cache with bulk requests before verifying each pair
+    _warm_entries([log_index for log_index, _ in pairs], debug)
+
+    def verify(pair):
+        try:
+            return inclusion(*pair, debug=debug)
+        except Exception as e:  # One bad pair must not discard the other results
+            if debug:
+                print("Inclusion check failed for", pair, e)
+            return False
+
+    with ThreadPoolExecutor(max_workers=_MAX_WORKERS) as executor:
+        return list(zip(pairs, executor.map(verify, pairs)))
 
 
 # Fetches the latest checkpoint from the Rekor log server
 def get_latest_checkpoint(debug=False):
     """
-    Fetch the latest checkpoint from the Rekor log server.
+    Fetch the latest checkpoint from the Rekor log server. The request is
+    conditional on the ETag of the last fetch, so an unchanged checkpoint
+    is served from memory.
     """
-    api = f"{base_url}/log"  # Construct the API URL to fetch the latest checkpoint
+    global _checkpoint_cached
+    api = _LOG_URL.format(_get_base_url())  # API URL of the latest checkpoint
+    etag, cached = _checkpoint_cached or (None, None)
+    headers = {"If-None-Match": etag} if etag else {}
 
     try:
-        checkpoint = requests.get(
-            api, timeout=10
-        ).json()  # Send GET request to fetch checkpoint
+        response = _session.get(
+            api, headers=headers, timeout=10
+        )  # Send conditional GET request to fetch checkpoint
     except requests.exceptions.Timeout:  # Handle timeout error
         if debug:
             print("Timed out")  # Print timeout message in debug mode
         return None
 
+    if response.status_code == 304:  # Checkpoint unchanged since the last fetch
+        return cached
+
+    checkpoint = orjson.loads(response.content)
+    if "ETag" in response.headers:  # Remember the checkpoint for the next poll
+        _checkpoint_cached = (response.headers["ETag"], checkpoint)
     return checkpoint  # Return the fetched checkpoint
 
 
 # Verifies the consistency of a checkpoint with the latest checkpoint from the log
-def consistency(prev_checkpoint, debug=False):
+def consistency(prev_checkpoint, debug=False, latest_checkpoint=None):
     """
     Verify the consistency between a previous \
     checkpoint and the latest one using Merkle proof.
+    Returns True if the checkpoints are consistent and False otherwise,
+    including when a request timed out, or None if prev_checkpoint is empty.
+    An already fetched latest checkpoint may be passed in to skip the fetch.
     """
     if prev_checkpoint == {}:  # Check if the previous checkpoint is empty
         if debug:
@@ -207,27 +508,35 @@ def consistency(prev_checkpoint, debug=False):
             )  # Print message if the checkpoint is empty
         return None
 
-    checkpoint = get_latest_checkpoint()  # Fetch the latest checkpoint
+    checkpoint = latest_checkpoint  # Reuse the latest checkpoint if given
+    if checkpoint is None:
+        checkpoint = get_latest_checkpoint()  # Fetch the latest checkpoint
+    if checkpoint is None:  # Timed out, so nothing could be verified
+        return False
 
     root_hash = checkpoint[
         "rootHash"
     ]  # Extract the root hash from the latest checkpoint
     tree_size = checkpoint["treeSize"]  # Extract the tree size
 
+    proof = []  # The tree has not grown, so no proof is needed for the roots
     try:
-        proof = requests.get(  # Send GET request to fetch the consistency proof
-            f'{base_url}/log/proof?firstSize={
-                prev_checkpoint["treeSize"]}&lastSize={tree_size}',
-            timeout=10,
-        ).json()[
-            "hashes"
-        ]  # Extract the list of hashes from the response
-        print(proof)
+        if prev_checkpoint["treeSize"] != tree_size:
+            proof = _request_json(  # Send GET request to fetch the consistency proof
+                "GET",
+                _PROOF_URL.format(
+                    _get_base_url(), prev_checkpoint["treeSize"], tree_size
+                ),
+            )[
+                "hashes"
+            ]  # Extract the list of hashes from the response
+        if debug:
+            print(proof)  # Print the consistency proof in debug mode
     except requests.exceptions.Timeout:  # Handle timeout error
         print("Timed out")
-        return None
+        return False  # A check that could not run has not passed
 
-    verify_consistency(  # Verify the consistency proof
+    return verify_consistency(  # Verify the consistency proof
         DefaultHasher,
         prev_checkpoint["treeSize"],
         tree_size,
@@ -236,44 +545,76 @@ def consistency(prev_checkpoint, debug=False):
         root_hash,
     )
 
-    return True  # Return True on successful consistency verification
 
+# Verifies the consistency of many checkpoints with concurrent Rekor requests
+def consistency_many(prev_checkpoints, debug=False):
+    """
+    Verify the consistency of many previous checkpoints with the latest one
+    concurrently. Returns a list of (checkpoint, result) tuples in input order.
+    A checkpoint whose check fails or raises gets False without affecting the
+    other results. The checks print their usual messages as they run, so
+    output from different checkpoints may interleave; use the returned
+    results instead.
+    """
+    prev_checkpoints = list(prev_checkpoints)
+    latest = get_latest_checkpoint()  # Fetched once and shared by every check
 
-# Entry point for the command-line interface
-def main():
+    def verify(prev):
+        try:
+            return consistency(prev, debug=debug, latest_checkpoint=latest)
+        except Exception as e:  # One bad checkpoint must not discard the others
+            if debug:
+                print("Consistency check failed for", prev, e)
+            return False
+
+    with ThreadPoolExecutor(max_workers=_MAX_WORKERS) as executor:
+        return list(zip(prev_checkpoints, executor.map(verify, prev_checkpoints)))
+
+
+# Builds the command-line argument parser on first use
+@functools.lru_cache(maxsize=None)
+def _build_parser():
     """
-    Entry point for the command-line interface
+    Build the argument parser for the command-line interface.
     """
-    debug = False  # Initialize debug mode as False by default
     parser = argparse.ArgumentParser(
-        description="Rekor Verifier"
+        prog="rektor", description="Rekor Verifier"
     )  # Create argument parser
 
     # Add arguments to the parser
     parser.add_argument(
-        "-d", "--debug", help="Debug mode", required=False, action="store_true"
+        "-d",
+        "--debug",
+        help="Debug mode, used together with a mode",
+        required=False,
+        action="store_true",
     )
-    parser.add_argument(
+    modes = parser.add_argument_group(
+        "modes", "At least one mode is required; modes run in the order listed."
+    )
+    modes.add_argument(
         "-c",
         "--checkpoint",
         help="Obtain latest checkpoint",
         required=False,
         action="store_true",
+        default=None,  # None when absent, like --inclusion
     )
-    parser.add_argument(
+    modes.add_argument(
         "--inclusion",
         help="Verify inclusion of an entry in the \
         Rekor Transparency Log using log index",
         required=False,
         type=int,
     )
-    parser.add_argument(
-        "--artifact", help="Artifact filepath for verifying signature", required=False
-    )
-    parser.add_argument(
+    modes.add_argument(
         "--consistency",
         help="Verify consistency of a given checkpoint with the latest checkpoint.",
         action="store_true",
+        default=None,  # None when absent, like --inclusion
+    )
+    parser.add_argument(
+        "--artifact", help="Artifact filepath for verifying signature", required=False
     )
     parser.add_argument(
         "--tree-id", help="Tree ID for consistency proof", required=False
@@ -284,44 +625,146 @@ def main():
     parser.add_argument(
         "--root-hash", help="Root hash for consistency proof", required=False
     )
+    return parser
 
-    args = parser.parse_args()  # Parse the command-line arguments
 
-    if args.debug:  # Check if debug mode is enabled
-        debug = True
-        print("enabled debug mode")  # Print debug mode enabled message
+# Prints the latest checkpoint
+def _run_checkpoint(args, debug):
+    """
+    Handle --checkpoint: fetch and print the latest checkpoint.
+    """
+    checkpoint = get_latest_checkpoint(debug)
+    print(
+        orjson.dumps(checkpoint, option=orjson.OPT_INDENT_2).decode()
+    )  # Print the checkpoint in formatted JSON
+
 
-    if args.checkpoint:  # If checkpoint flag is set, fetch the latest checkpoint
-        checkpoint = get_latest_checkpoint(debug)
-        print(
-            json.dumps(checkpoint, indent=4)
-        )  # Print the checkpoint in formatted JSON
+# Verifies the inclusion of the log entry
+def _run_inclusion(args, debug):
+    """
+    Handle --inclusion: verify inclusion of the artifact in the log.
+    """
+    return inclusion(args.inclusion, args.artifact, debug)
 
-    if args.inclusion:  # If inclusion flag is set, verify inclusion of the log entry
-        inclusion(args.inclusion, args.artifact, debug)
 
+# Verifies the consistency of the given checkpoint with the latest one
+def _run_consistency(args, debug, latest_checkpoint=None):
+    """
+    Handle --consistency: verify the given checkpoint against the latest one.
+    An already fetched latest checkpoint may be passed in to skip the fetch.
+    """
     if (
-        args.consistency
-    ):  # If consistency flag is set, verify the consistency of checkpoints
-        if (
-            not args.tree_id or not args.tree_size or not args.root_hash
-        ):  # Ensure required fields are provided
-            print(
-                "Please specify tree id, tree size, and root hash for prev checkpoint"
-            )
-            return
+        not args.tree_id or not args.tree_size or not args.root_hash
+    ):  # Ensure required fields are provided
+        print("Please specify tree id, tree size, and root hash for prev checkpoint")
+        return False  # Nothing was verified, so the check has not passed
+
+    prev_checkpoint = {  # Build the previous checkpoint object
+        "treeID": args.tree_id,
+        "treeSize": args.tree_size,
+        "rootHash": args.root_hash,
+    }
+
+    # Perform consistency verification
+    result = consistency(prev_checkpoint, debug, latest_checkpoint)
+    if result is False:
+        print("Consistency cannot be verified")
+    return result
+
+
+# Fetches the data both --inclusion and --consistency need at the same time
+def _prefetch(args, debug):
+    """
+    Fetch the log entry and the latest checkpoint concurrently so the
+    inclusion and consistency checks that follow start from warm data.
+    Returns the latest checkpoint, or None if it was not fetched. The
+    consistency proof depends on the latest tree size, so it is still
+    fetched afterwards.
+    """
+    if not (args.tree_id and args.tree_size and args.root_hash):
+        return None  # Consistency will not run, nothing to overlap
+
+    # A short-lived pool, like the batch verifiers use for their requests
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        executor.submit(_get_entry, args.inclusion, debug)  # Fills the cache
+        latest = executor.submit(get_latest_checkpoint, debug)
+    try:
+        return latest.result()
+    except requests.exceptions.RequestException:
+        return None  # Let the consistency check fetch and report it itself
 
-        prev_checkpoint = {  # Build the previous checkpoint object
-            "treeID": args.tree_id,
-            "treeSize": args.tree_size,
-            "rootHash": args.root_hash,
-        }
 
-        try:
-            # Perform consistency verification
-            consistency(prev_checkpoint, debug)
-        except RootMismatchError:
-            print("Consistency cannot be verified")
+# Handlers for each mode, in the order they run
+_MODE_HANDLERS = {
+    "checkpoint": _run_checkpoint,
+    "inclusion": _run_inclusion,
+    "consistency": _run_consistency,
+}
+
+
+# Parses the command-line arguments, with a fast path for inclusion checks
+def _parse_args(argv):
+    """
+    Parse the command-line arguments. The common
+    `--inclusion <log_index> --artifact <filepath>` invocation is recognised
+    directly, without building the argparse parser.
+    """
+    if (
+        len(argv) == 4
+        and argv[0] == "--inclusion"
+        and sane_index(argv[1])
+        and argv[2] == "--artifact"
+        and not argv[3].startswith("-")  # Leave option-like values to argparse
+    ):
+        return argparse.Namespace(
+            debug=False,
+            checkpoint=None,
+            inclusion=int(argv[1]),
+            consistency=None,
+            artifact=argv[3],
+            tree_id=None,
+            tree_size=None,
+            root_hash=None,
+        )
+    return _build_parser().parse_args(argv)
+
+
+# Entry point for the command-line interface
+def main():
+    """
+    Entry point for the command-line interface
+    """
+    args = _parse_args(sys.argv[1:])  # Parse the command-line arguments
+
+    # Modes given on the command line, in the order they run
+    handlers = [
+        handler
+        for mode, handler in _MODE_HANDLERS.items()
+        if getattr(args, mode) is not None
+    ]
+    if not handlers:  # Fail fast before doing any work
+        _build_parser().error(
+            "one of --checkpoint, --inclusion or --consistency is required"
+        )
+
+    debug = args.debug
+    if debug:  # Check if debug mode is enabled
+        print("enabled debug mode")  # Print debug mode enabled message
+
+    if args.inclusion is not None and args.consistency is not None:
+        latest = _prefetch(args, debug)  # Fetched alongside the log entry
+        handlers = [
+            (
+                functools.partial(handler, latest_checkpoint=latest)
+                if handler is _run_consistency
+                else handler
+            )
+            for handler in handlers
+        ]
+
+    results = [handler(args, debug) for handler in handlers]
+    if any(result is False for result in results):  # A verification failed
+        sys.exit(1)
 
 
 if __name__ == "__main__":
@@ -5,20 +5,31 @@ leaves, nodes, verifying consistency and inclusion proofs, and
 computing leaf hashes.
 """
 
+from collections import OrderedDict
+import functools
 import hashlib
+import itertools
 import binascii
-import base64
 
 # domain separation prefixes according to the RFC
 RFC6962_LEAF_HASH_PREFIX = 0
 RFC6962_NODE_HASH_PREFIX = 1
+_LEAF_PREFIX = bytes([RFC6962_LEAF_HASH_PREFIX])
+_NODE_PREFIX = bytes([RFC6962_NODE_HASH_PREFIX])
 
 
 class Hasher:
     """Hasher class to create and manage hash operations."""
 
-    def __init__(self, hash_func=hashlib.sha256):
+    def __init__(self, hash_func=hashlib.sha256, cache_size=10000):
         self.hash_func = hash_func
+        # Node digests keyed by left + right, shared across verifications, so
+        # nodes that stay stable while the log grows are only hashed once
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+        # Hash state with the node prefix already absorbed, copied per node
+        self._node_template = hash_func()  # hash_func is a zero-argument factory
+        self._node_template.update(_NODE_PREFIX)
 
     def new(self):
         """Creates a new hash object."""
@@ -31,16 +42,26 @@ class Hasher:
     def hash_leaf(self, leaf):
         """Hashes a leaf using the RFC 6962 specification."""
         h = self.new()
-        h.update(bytes([RFC6962_LEAF_HASH_PREFIX]))
+        h.update(_LEAF_PREFIX)
         h.update(leaf)
         return h.digest()
 
     def hash_children(self, left, right):
-        """Hashes two child nodes."""
-        h = self.new()
-        b = bytes([RFC6962_NODE_HASH_PREFIX]) + left + right
-        h.update(b)
-        return h.digest()
+        """Hashes two child nodes, reusing previously computed digests."""
+        # One 64-byte concatenation serves as both the cache key and the hash
+        # input; a shared node buffer would still need a bytes copy for the key
+        key = left + right
+        digest = self._cache.get(key)
+        if digest is not None:
+            return digest
+        # Copying the prefixed state is cheaper than a fresh hash context
+        h = self._node_template.copy()
+        h.update(key)
+        digest = h.digest()
+        self._cache[key] = digest
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)  # Evict the oldest node digest
+        return digest
 
     def size(self):
         """Returns the size of the hash output."""
@@ -51,60 +72,93 @@ class Hasher:
 DefaultHasher = Hasher(hashlib.sha256)
 
 
+def decode_proof(hasher, proof):
+    """Decodes hex proof hashes into one buffer of concatenated digests."""
+    # Each hash is checked on its own so a re-split proof cannot pass
+    width = 2 * hasher.size()
+    for elem in proof:
+        if len(elem) != width:
+            raise ValueError(f"proof hash has length {len(elem)}, want {width}")
+    proof_bytes = bytes.fromhex("".join(proof))
+    if len(proof_bytes) != len(proof) * hasher.size():  # fromhex skips spaces
+        raise ValueError("proof hashes are not valid hex digests")
+    return proof_bytes
+
+
 def verify_consistency(hasher, size1, size2, proof, root1, root2):
-    """Verifies the consistency between two root hashes."""
+    """Verifies the consistency between two root hashes.
+
+    Returns True if the proof links both roots and False otherwise.
+    """
     try:
         root1 = bytes.fromhex(root1)
         root2 = bytes.fromhex(root2)
     except ValueError:
         print("Invalid root(s)")
-        return
-    bytearray_proof = [bytes.fromhex(elem) for elem in proof]
+        return False
+    # Decode every proof hash into one contiguous buffer of digests
+    proof_bytes = decode_proof(hasher, proof)
+    proof_len = len(proof)
 
     if size2 < size1:
         raise ValueError(f"size2 ({size2}) < size1 ({size1})")
     if size1 == size2:
-        if bytearray_proof:
+        if proof_len:
             raise ValueError("size1=size2, but bytearray_proof is not empty")
-        verify_match(root1, root2)
-        return
-    if size1 == 0:
-        if bytearray_proof:
+        hash1 = hash2 = root1  # The tree has not grown, so the roots must match
+    elif size1 == 0:
+        if proof_len:
             raise ValueError(
-                f"expected empty bytearray_proof, but got {
-                    len(bytearray_proof)} components"
+                f"expected empty bytearray_proof, but got {proof_len} components"
             )
-        return
-    if not bytearray_proof:
+        return True
+    elif not proof_len:
         raise ValueError("empty bytearray_proof")
+    elif size1 & (size1 - 1) == 0:  # size1 is a power of two
+        hash1 = root1  # The old tree is a complete subtree of the new one
+        hash2 = _root_from_pow2_proof(hasher, size1, size2, proof_bytes, root1)
+    else:
+        inner, border = decomp_incl_proof(size1 - 1, size2)
+        shift = (size1 & -size1).bit_length() - 1
+        inner -= shift
+
+        if proof_len != 1 + inner + border:
+            raise ValueError(
+                f"wrong bytearray_proof size {proof_len}, want {1 + inner + border}"
+            )
 
-    inner, border = decomp_incl_proof(size1 - 1, size2)
-    shift = (size1 & -size1).bit_length() - 1
-    inner -= shift
-
-    seed, start = (root1, 0) if size1 == 1 << shift else (bytearray_proof[0], 1)
-
-    if len(bytearray_proof) != start + inner + border:
-        raise ValueError(
-            f"wrong bytearray_proof size {len(bytearray_proof)}, want {
-                start + inner + border}"
+        # Both roots are rebuilt in one pass over the proof digests
+        seed = next(iter_digests(proof_bytes, hasher.size(), 0, 1))
+        mask = (size1 - 1) >> shift
+        hash1, hash2 = chain_consistency(
+            hasher, seed, proof_bytes, 1, inner, border, mask
         )
 
-    bytearray_proof = bytearray_proof[start:]
-
-    mask = (size1 - 1) >> shift
-    hash1 = chain_inner_right(hasher, seed, bytearray_proof[:inner], mask)
-    hash1 = chain_border_right(hasher, hash1, bytearray_proof[inner:])
-    verify_match(hash1, root1)
-
-    hash2 = chain_inner(hasher, seed, bytearray_proof[:inner], mask)
-    hash2 = chain_border_right(hasher, hash2, bytearray_proof[inner:])
     try:
+        verify_match(hash1, root1)
         verify_match(hash2, root2)
-        print("Consistency verification successful")
-    except Exception:
+    except RootMismatchError:
         print("Consistency verification failed")
-        exit()
+        return False
+    print("Consistency verification successful")
+    return True
+
+
+def _root_from_pow2_proof(hasher, size1, size2, proof, root1):
+    """Calculates the new root from a proof whose old tree size is 2^k."""
+    # The old tree is a complete subtree on the left edge of the new one, so
+    # root1 is the seed, there are no border nodes and every proof digest
+    # is a right sibling
+    inner = ((size1 - 1) ^ (size2 - 1)).bit_length() - size1.bit_length() + 1
+    proof_len, remainder = divmod(len(proof), hasher.size())
+    if remainder or proof_len != inner:
+        raise ValueError(f"wrong bytearray_proof size {proof_len}, want {inner}")
+
+    hash_children = hasher.hash_children
+    seed = root1
+    for h in iter_digests(proof, hasher.size(), 0, inner):
+        seed = hash_children(seed, h)
+    return seed
 
 
 def verify_match(calculated, expected):
@@ -116,7 +170,7 @@ def verify_match(calculated, expected):
 def decomp_incl_proof(index, size):
     """Decomposes the inclusion proof to get inner and border sizes."""
     inner = inner_proof_size(index, size)
-    border = bin(index >> inner).count("1")
+    border = (index >> inner).bit_count()  # Popcount, no string round-trip
     return inner, border
 
 
@@ -125,28 +179,50 @@ def inner_proof_size(index, size):
     return (index ^ (size - 1)).bit_length()
 
 
-def chain_inner(hasher, seed, proof, index):
-    """Chains hashes for inner nodes based on the proof and index."""
-    for i, h in enumerate(proof):
-        if (index >> i) & 1 == 0:
-            seed = hasher.hash_children(seed, h)
-        else:
-            seed = hasher.hash_children(h, seed)
-    return seed
+def iter_digests(proof, size, start, count):
+    """Yields count digests of the given size from a concatenated buffer."""
+    offsets = range(start * size, (start + count + 1) * size, size)
+    return (proof[lo:hi] for lo, hi in zip(offsets, offsets[1:]))
 
 
-def chain_inner_right(hasher, seed, proof, index):
-    """Chains hashes from the right for inner nodes based on proof and index."""
-    for i, h in enumerate(proof):
-        if (index >> i) & 1 == 1:
-            seed = hasher.hash_children(h, seed)
+def chain_inner(hasher, seed, proof, start, count, index):
+    """Chains count proof digests from position start for inner nodes."""
+    hash_children = hasher.hash_children
+    bits = index
+    for h in iter_digests(proof, hasher.size(), start, count):
+        if bits & 1:
+            seed = hash_children(h, seed)
+        else:
+            seed = hash_children(seed, h)
+        bits >>= 1
     return seed
 
 
-def chain_border_right(hasher, seed, proof):
-    """Chains hashes for border nodes based on the proof."""
-    for h in proof:
-        seed = hasher.hash_children(h, seed)
+def chain_consistency(hasher, seed, proof, start, inner, border, mask):
+    """Chains the proof digests for the old and new roots in a single pass."""
+    # The old root only takes the inner digests selected by the mask, while
+    # the new root takes all of them; both then take every border digest
+    hash_children = hasher.hash_children
+    old = new = seed
+    digests = iter_digests(proof, hasher.size(), start, inner + border)
+    for h in itertools.islice(digests, inner):
+        if mask & 1:
+            old = hash_children(h, old)
+            new = hash_children(h, new)
+        else:
+            new = hash_children(new, h)
+        mask >>= 1
+    for h in digests:
+        old = hash_children(h, old)
+        new = hash_children(h, new)
+    return old, new
+
+
+def chain_border_right(hasher, seed, proof, start, count):
+    """Chains count proof digests from position start for border nodes."""
+    hash_children = hasher.hash_children
+    for h in iter_digests(proof, hasher.size(), start, count):
+        seed = hash_children(h, seed)
     return seed
 
 
@@ -154,16 +230,17 @@ class RootMismatchError(Exception):
     """Custom exception raised when root hashes do not match."""
 
     def __init__(self, expected_root, calculated_root):
-        self.expected_root = binascii.hexlify(bytearray(expected_root))
-        self.calculated_root = binascii.hexlify(bytearray(calculated_root))
+        # Raw digests; they are only hex-encoded if the error is printed
+        self.expected_root = expected_root
+        self.calculated_root = calculated_root
 
     def __str__(self):
-        return f"calculated:\n{self.calculated_root}\n \
-        expected root:\n{self.expected_root}"
+        return f"calculated:\n{binascii.hexlify(self.calculated_root)}\n \
+        expected root:\n{binascii.hexlify(self.expected_root)}"
 
 
 def root_from_inclusion_proof(hasher, index, size, leaf_hash, proof):
-    """Calculates the root from an inclusion proof."""
+    """Calculates the root from an inclusion proof of concatenated digests."""
     if index >= size:
         raise ValueError(f"index is beyond size: {index} >= {size}")
 
@@ -174,20 +251,22 @@ def root_from_inclusion_proof(hasher, index, size, leaf_hash, proof):
         )
 
     inner, border = decomp_incl_proof(index, size)
-    if len(proof) != inner + border:
-        raise ValueError(
-            f"wrong proof size {
-                         len(proof)}, want {inner + border}"
-        )
+    proof_len, remainder = divmod(len(proof), hasher.size())
+    if remainder or proof_len != inner + border:
+        raise ValueError(f"wrong proof size {proof_len}, want {inner + border}")
 
-    res = chain_inner(hasher, leaf_hash, proof[:inner], index)
-    res = chain_border_right(hasher, res, proof[inner:])
+    res = chain_inner(hasher, leaf_hash, proof, 0, inner, index)
+    res = chain_border_right(hasher, res, proof, inner, border)
     return res
 
 
 def verify_inclusion(hasher, index, size, leaf_hash, proof, root, debug=False):
-    """Verifies the inclusion of a leaf hash in a Merkle tree."""
-    bytearray_proof = [bytes.fromhex(elem) for elem in proof]
+    """Verifies the inclusion of a leaf hash in a Merkle tree.
+
+    Returns True if the proof leads to the given root and False otherwise.
+    """
+    # Decode every proof hash into one contiguous buffer of digests
+    bytearray_proof = decode_proof(hasher, proof)
     bytearray_root = bytes.fromhex(root)
     bytearray_leaf = bytes.fromhex(leaf_hash)
     calc_root = root_from_inclusion_proof(
@@ -199,20 +278,45 @@ def verify_inclusion(hasher, index, size, leaf_hash, proof, root, debug=False):
 
     try:
         verify_match(calc_root, bytearray_root)
-        print("Offline root hash calculation for inclusion verified")
-    except Exception as e:
+    except RootMismatchError as e:
         if debug:
             print("Exception:", e)
         print("Offline root hash calculation for inclusion could not be verified")
-        exit()
+        return False
+    print("Offline root hash calculation for inclusion verified")
+    return True
+
+
+def verify_inclusion_batch(hasher, proofs):
+    """Verifies many (index, size, leaf_hash, proof, root) inclusion proofs.
+
+    Returns one boolean per proof in input order instead of printing or
+    exiting, so a bad proof does not stop the batch. Proofs against the
+    same tree share their upper nodes through the hasher's node cache.
+    """
+    results = []
+    for index, size, leaf_hash, proof, root in proofs:
+        try:
+            calc_root = root_from_inclusion_proof(
+                hasher,
+                index,
+                size,
+                bytes.fromhex(leaf_hash),
+                decode_proof(hasher, proof),
+            )
+            results.append(calc_root == bytes.fromhex(root))
+        except ValueError:  # Malformed hex or a proof of the wrong shape
+            results.append(False)
+    return results
 
 
 # Requires entry["body"] output for a log entry
 # Returns the leaf hash according to the RFC 6962 spec
+@functools.lru_cache(maxsize=4096)
 def compute_leaf_hash(body):
     """Computes the leaf hash from the entry body."""
-    entry_bytes = base64.b64decode(body)
+    entry_bytes = binascii.a2b_base64(body)
     h = hashlib.sha256()
-    h.update(bytes([RFC6962_LEAF_HASH_PREFIX]))
+    h.update(_LEAF_PREFIX)
     h.update(entry_bytes)
     return h.hexdigest()
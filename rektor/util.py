@@ -4,6 +4,7 @@ from cryptography.hazmat.primitives import serialization
 
 from cryptography.hazmat.primitives import hashes
 from cryptography.hazmat.primitives.asymmetric import ec
+from cryptography.hazmat.primitives.asymmetric.utils import Prehashed
 from cryptography.hazmat.primitives.serialization import load_pem_public_key
 from cryptography.exceptions import InvalidSignature
 
@@ -34,7 +35,8 @@ def extract_public_key(cert):
     return pem_public_key
 
 
-def verify_artifact_signature(signature, public_key, artifact_filename):
+# verifies a signature over an artifact given its precomputed sha256 digest
+def verify_artifact_signature(signature, public_key, artifact_digest):
     # load the public key
     # with open("cert_public.pem", "rb") as pub_key_file:
     #    public_key = load_pem_public_key(pub_key_file.read())
@@ -44,16 +46,17 @@ def verify_artifact_signature(signature, public_key, artifact_filename):
     #        signature = sig_file.read()
 
     public_key = load_pem_public_key(public_key)
-    # load the data to be verified
-    with open(artifact_filename, "rb") as data_file:
-        data = data_file.read()
 
-    # verify the signature
+    # verify the signature over the prehashed artifact
     try:
-        public_key.verify(signature, data, ec.ECDSA(hashes.SHA256()))
+        public_key.verify(
+            signature, artifact_digest, ec.ECDSA(Prehashed(hashes.SHA256()))
+        )
         print("Signature is valid")
+        return True
     except InvalidSignature:
         print("Signature is invalid")
-        exit()
+        return False
     except Exception as e:
         print("Exception in verifying artifact signature:", e)
+        return False
@@ -0,0 +1,16 @@
+import pytest
+from rektor import main as rektor_main
+from rektor import merkle_proof
+
+
+@pytest.fixture(autouse=True)
+def clear_caches():
+    # main() runs in-process, so drop the module state earlier tests left behind
+    rektor_main._entry_cache.clear()
+    rektor_main._verified_signatures.clear()
+    rektor_main._checkpoint_cached = None
+    merkle_proof.DefaultHasher._cache.clear()
+    rektor_main._get_base_url.cache_clear()
+    rektor_main._parse_cert.cache_clear()
+    rektor_main._build_parser.cache_clear()
+    merkle_proof.compute_leaf_hash.cache_clear()
@@ -1,4 +1,6 @@
-import subprocess
+import sys
+import pytest
+from rektor.main import main
 
 # Define a schema for the expected consistency output (modify as needed)
 consistency_schema = {
@@ -13,13 +15,13 @@ consistency_schema = {
 }
 
 
-def test_consistency():
-    # Run the main.py script with the updated valid values for the --consistency flag
-    result = subprocess.run(
+def test_consistency(capsys, monkeypatch):
+    # Run main in-process with the updated valid values for the --consistency flag
+    monkeypatch.setattr(
+        sys,
+        "argv",
         [
-            "python",
-            "-m",
-            "rektor.main",
+            "rektor",
             "--consistency",
             "--tree-id",
             "11930509599166506",
@@ -28,12 +30,12 @@ def test_consistency():
             "--root-hash",
             "83edbcbc1ab683a272b48016ae81ba7903f69af7f99e9805eb52804191ed03fc10",
         ],
-        capture_output=True,
-        text=True,
     )
+    with pytest.raises(SystemExit) as excinfo:  # A failed check exits with 1
+        main()
+    assert excinfo.value.code == 1
 
-    output = result.stdout
-    error_output = result.stderr
+    output, error_output = capsys.readouterr()
 
     # Print output for debugging
     print("STDOUT:", output)
@@ -1,4 +1,6 @@
-import subprocess
+import sys
+import pytest
+from rektor.main import main
 
 # Define a schema for the expected consistency output (modify as needed)
 consistency_schema = {
@@ -13,24 +15,24 @@ consistency_schema = {
 }
 
 
-def test_consistency():
-    # Run the main.py script with the updated valid values for the --consistency flag
-    result = subprocess.run(
+def test_consistency(capsys, monkeypatch):
+    # Run main in-process with the updated valid values for the --consistency flag
+    monkeypatch.setattr(
+        sys,
+        "argv",
         [
-            "python",
-            "-m",
-            "rektor.main",
+            "rektor",
             "--inclusion",
             "133040968",
             "--artifact",
             "artifact.md",
         ],
-        capture_output=True,
-        text=True,
     )
+    with pytest.raises(SystemExit) as excinfo:  # A failed check exits with 1
+        main()
+    assert excinfo.value.code == 1
 
-    output = result.stdout
-    error_output = result.stderr
+    output, error_output = capsys.readouterr()
 
     # Print output for debugging
     print("STDOUT:", output)
@@ -0,0 +1,96 @@
+import orjson
+import requests
+from rektor import main as rektor_main
+
+
+def test_inclusion_many_keeps_other_results(monkeypatch):
+    # A pair that raises gets False; the other pairs keep their results
+    def inclusion(log_index, artifact_filepath, debug=False):
+        if artifact_filepath == "missing":
+            raise FileNotFoundError(artifact_filepath)
+        return log_index != 2
+
+    monkeypatch.setattr(rektor_main, "_warm_entries", lambda *a: None)
+    monkeypatch.setattr(rektor_main, "inclusion", inclusion)
+    pairs = [(1, "a"), (2, "b"), (3, "missing"), (4, "c")]
+    results = rektor_main.inclusion_many(pairs)
+    assert results == list(zip(pairs, [True, False, False, True]))
+
+
+def test_consistency_many_keeps_other_results(monkeypatch):
+    def consistency(prev, debug=False, latest_checkpoint=None):
+        if prev["treeSize"] is None:
+            raise ValueError("malformed proof")
+        return True
+
+    monkeypatch.setattr(rektor_main, "get_latest_checkpoint", lambda *a: None)
+    monkeypatch.setattr(rektor_main, "consistency", consistency)
+    checkpoints = [{"treeSize": 1}, {"treeSize": None}, {"treeSize": 3}]
+    results = rektor_main.consistency_many(checkpoints)
+    assert results == list(zip(checkpoints, [True, False, True]))
+
+
+def fake_entry(log_index):
+    # A minimal log entry; the body only has to be valid base64
+    return {"logIndex": log_index, "body": "e30="}
+
+
+def test_get_log_entries_bulk_single_request(monkeypatch):
+    calls = []
+
+    def request_json(method, api, **kwargs):
+        calls.append(method)
+        indexes = orjson.loads(kwargs["data"])["logIndexes"]
+        return [{str(index): fake_entry(index)} for index in indexes]
+
+    monkeypatch.setattr(rektor_main, "_request_json", request_json)
+    entries = rektor_main.get_log_entries_bulk([3, "1", 3, "x"])
+    assert entries == [fake_entry(3), fake_entry(1), fake_entry(3), None]
+    assert calls == ["POST"]
+    entries[0]["body"] = "modified"  # Copies, so the cache is left untouched
+    assert rektor_main.get_log_entries_bulk([3]) == [fake_entry(3)]
+    assert calls == ["POST"]
+
+
+def test_get_log_entries_bulk_falls_back_per_index(monkeypatch):
+    calls = []
+
+    def request_json(method, api, **kwargs):
+        calls.append(method)
+        if method == "POST":
+            raise requests.exceptions.ConnectionError("bulk retrieve down")
+        index = int(api.rsplit("=", 1)[-1])
+        if index == 2:
+            return {"code": 404, "message": "not found"}  # Not a log entry
+        return {str(index): fake_entry(index)}
+
+    monkeypatch.setattr(rektor_main, "_request_json", request_json)
+    entries = rektor_main.get_log_entries_bulk([1, 2, 4])
+    assert entries == [fake_entry(1), None, fake_entry(4)]
+    assert calls == ["POST", "GET", "GET", "GET"]
+
+
+class FakeResponse:
+    def __init__(self, status_code, content=b"", headers=None):
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers or {}
+
+
+def test_get_latest_checkpoint_not_modified(monkeypatch):
+    # The second poll sends the ETag and gets the cached checkpoint on a 304
+    checkpoint = {"treeID": "1", "treeSize": 5, "rootHash": "00" * 32}
+    responses = [
+        FakeResponse(200, orjson.dumps(checkpoint), {"ETag": '"v1"'}),
+        FakeResponse(304),
+    ]
+    sent_headers = []
+
+    def get(api, headers=None, timeout=None):
+        sent_headers.append(headers)
+        return responses.pop(0)
+
+    monkeypatch.setattr(rektor_main._session, "get", get)
+    assert rektor_main.get_latest_checkpoint() == checkpoint
+    assert rektor_main.get_latest_checkpoint() == checkpoint
+    assert sent_headers == [{}, {"If-None-Match": '"v1"'}]
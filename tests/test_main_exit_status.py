@@ -0,0 +1,34 @@
+import sys
+import pytest
+from rektor import main as rektor_main
+
+
+def test_consistency_missing_fields_exits_1(capsys, monkeypatch):
+    # A consistency check that cannot run must not exit 0
+    monkeypatch.setattr(sys, "argv", ["rektor", "--consistency", "--tree-id", "1"])
+    with pytest.raises(SystemExit) as excinfo:
+        rektor_main.main()
+    assert excinfo.value.code == 1
+    assert "Please specify" in capsys.readouterr().out
+
+
+def test_consistency_timeout_exits_1(monkeypatch):
+    # get_latest_checkpoint returns None when the request times out
+    monkeypatch.setattr(rektor_main, "get_latest_checkpoint", lambda *a: None)
+    monkeypatch.setattr(
+        sys,
+        "argv",
+        [
+            "rektor",
+            "--consistency",
+            "--tree-id",
+            "1",
+            "--tree-size",
+            "2",
+            "--root-hash",
+            "00" * 32,
+        ],
+    )
+    with pytest.raises(SystemExit) as excinfo:
+        rektor_main.main()
+    assert excinfo.value.code == 1
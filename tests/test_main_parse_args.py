@@ -0,0 +1,24 @@
+import pytest
+from rektor.main import _build_parser, _parse_args
+
+
+def test_parse_args_inclusion_fast_path():
+    # The fast path must produce the same namespace as the argparse parser
+    argv = ["--inclusion", "133040969", "--artifact", "artifact.md"]
+    assert vars(_parse_args(argv)) == vars(_build_parser().parse_args(argv))
+    assert _parse_args(argv).inclusion == 133040969
+
+
+def test_parse_args_falls_back_to_argparse():
+    # Anything else, including extra flags, goes through argparse
+    args = _parse_args(["--debug", "--inclusion", "7", "--artifact", "artifact.md"])
+    assert args.debug and args.inclusion == 7
+
+    # Digits that int() rejects are reported by argparse, not by int()
+    with pytest.raises(SystemExit):
+        _parse_args(["--inclusion", "²", "--artifact", "artifact.md"])
+
+    # An option where the artifact path should be is an argparse error
+    for artifact in ("--debug", "-x"):
+        with pytest.raises(SystemExit):
+            _parse_args(["--inclusion", "5", "--artifact", artifact])
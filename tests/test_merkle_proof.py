@@ -0,0 +1,167 @@
+import hashlib
+import os
+import pytest
+from rektor.merkle_proof import (
+    DefaultHasher,
+    Hasher,
+    _root_from_pow2_proof,
+    chain_consistency,
+    verify_consistency,
+    verify_inclusion_batch,
+)
+
+# Leaves of a small known tree, used to build RFC 6962 reference values
+LEAVES = [f"leaf {i}".encode() for i in range(13)]
+
+
+def leaf_hash(data):
+    return hashlib.sha256(b"\x00" + data).digest()
+
+
+def node_hash(left, right):
+    return hashlib.sha256(b"\x01" + left + right).digest()
+
+
+def split(n):
+    # Largest power of two smaller than n, as in RFC 6962 section 2.1
+    return 1 << ((n - 1).bit_length() - 1)
+
+
+def tree_root(leaves):
+    if len(leaves) == 1:
+        return leaf_hash(leaves[0])
+    k = split(len(leaves))
+    return node_hash(tree_root(leaves[:k]), tree_root(leaves[k:]))
+
+
+def inclusion_path(index, leaves):
+    if len(leaves) == 1:
+        return []
+    k = split(len(leaves))
+    if index < k:
+        return inclusion_path(index, leaves[:k]) + [tree_root(leaves[k:])]
+    return inclusion_path(index - k, leaves[k:]) + [tree_root(leaves[:k])]
+
+
+def consistency_proof(size1, leaves, complete=True):
+    if size1 == len(leaves):
+        return [] if complete else [tree_root(leaves)]
+    k = split(len(leaves))
+    if size1 <= k:
+        return consistency_proof(size1, leaves[:k], complete) + [tree_root(leaves[k:])]
+    return consistency_proof(size1 - k, leaves[k:], False) + [tree_root(leaves[:k])]
+
+
+def inclusion_items(size):
+    root = tree_root(LEAVES[:size]).hex()
+    return [
+        (
+            index,
+            size,
+            leaf_hash(LEAVES[index]).hex(),
+            [h.hex() for h in inclusion_path(index, LEAVES[:size])],
+            root,
+        )
+        for index in range(size)
+    ]
+
+
+def test_hasher_accepts_zero_argument_factory():
+    # hash_func only has to be callable without arguments, like hashlib.sha256
+    hasher = Hasher(lambda: hashlib.sha256())
+    left, right = leaf_hash(LEAVES[0]), leaf_hash(LEAVES[1])
+    assert hasher.hash_children(left, right) == node_hash(left, right)
+    assert hasher.hash_leaf(LEAVES[0]) == leaf_hash(LEAVES[0])
+
+
+def test_verify_inclusion_batch_known_tree():
+    items = [
+        item for size in range(1, len(LEAVES) + 1) for item in inclusion_items(size)
+    ]
+    assert verify_inclusion_batch(DefaultHasher, items) == [True] * len(items)
+
+
+def test_verify_inclusion_batch_tampered_proof():
+    index, size, leaf, proof, root = inclusion_items(13)[5]
+    last_byte = "00" if proof[0][-2:] != "00" else "ff"
+    tampered = [proof[0][:-2] + last_byte] + proof[1:]  # One byte changed
+    other_root = tree_root(LEAVES[:12]).hex()
+    results = verify_inclusion_batch(
+        DefaultHasher,
+        [
+            (index, size, leaf, tampered, root),
+            (index, size, leaf, proof, other_root),
+            (index, size, leaf, proof, root),
+        ],
+    )
+    assert results == [False, False, True]
+
+
+def test_verify_inclusion_batch_malformed_hex():
+    index, size, leaf, proof, root = inclusion_items(13)[5]
+    joined = "".join(proof)
+    results = verify_inclusion_batch(
+        DefaultHasher,
+        [
+            (index, size, leaf, ["zz" * 32] + proof[1:], root),  # Not hex
+            (index, size, leaf, [joined[:10], joined[10:]], root),  # Re-split
+            (index, size, leaf, [proof[0][:63]] + proof[1:], root),  # Odd length
+            (index, size, "zz", proof, root),  # Bad leaf hash
+        ],
+    )
+    assert results == [False] * 4
+
+
+def test_root_from_pow2_proof():
+    for size1 in (1, 2, 4, 8):
+        root1 = tree_root(LEAVES[:size1])
+        for size2 in range(size1 + 1, len(LEAVES) + 1):
+            proof = b"".join(consistency_proof(size1, LEAVES[:size2]))
+            root2 = _root_from_pow2_proof(DefaultHasher, size1, size2, proof, root1)
+            assert root2 == tree_root(LEAVES[:size2])
+
+    proof = b"".join(consistency_proof(4, LEAVES[:13]))
+    with pytest.raises(ValueError):
+        _root_from_pow2_proof(DefaultHasher, 4, 13, proof[32:], tree_root(LEAVES[:4]))
+
+
+def naive_inner_right(seed, digests, mask):
+    # Hashes the digests selected by the set bits of mask, one bit at a time
+    for i, h in enumerate(digests):
+        if (mask >> i) & 1:
+            seed = node_hash(h, seed)
+    return seed
+
+
+def test_chain_consistency():
+    digests = [os.urandom(32) for _ in range(9)]
+    seed = os.urandom(32)
+    proof = b"".join(digests)
+    inner, border = 6, 3
+    for mask in (0, 0b101010, 0b111110, 0b100000):
+        old, new = chain_consistency(DefaultHasher, seed, proof, 0, inner, border, mask)
+
+        expected_old = naive_inner_right(seed, digests[:inner], mask)
+        expected_new = seed
+        for i, h in enumerate(digests[:inner]):
+            if (mask >> i) & 1:
+                expected_new = node_hash(h, expected_new)
+            else:
+                expected_new = node_hash(expected_new, h)
+        for h in digests[inner:]:  # Both roots take every border digest
+            expected_old = node_hash(h, expected_old)
+            expected_new = node_hash(h, expected_new)
+        assert (old, new) == (expected_old, expected_new)
+
+
+def test_verify_consistency_known_tree():
+    for size2 in range(1, len(LEAVES) + 1):
+        root2 = tree_root(LEAVES[:size2]).hex()
+        for size1 in range(1, size2 + 1):
+            proof = [h.hex() for h in consistency_proof(size1, LEAVES[:size2])]
+            root1 = tree_root(LEAVES[:size1]).hex()
+            assert verify_consistency(DefaultHasher, size1, size2, proof, root1, root2)
+            if size1 < size2:  # A wrong new root must be rejected
+                assert not verify_consistency(
+                    DefaultHasher, size1, size2, proof, root1, root1
+                )